@@ -4,6 +4,7 @@ import unittest
 import copy
 import yaml
 import math
+import random
 from argparse import Namespace
 from onmt.transforms import (
     get_transforms_cls,
@@ -95,6 +96,50 @@ class TestTransform(unittest.TestCase):
         # 7. after report, statistics become empty as a fresh start
         self.assertTrue(len(transform_pipe.statistics.observables) == 0)
 
+    def test_transform_pipe_batch_apply(self):
+        prefix_cls = get_transforms_cls(["prefix"])["prefix"]
+        corpora = yaml.safe_load("""
+            trainset:
+                path_src: data/src-train.txt
+                path_tgt: data/tgt-train.txt
+                transforms: [prefix, filtertoolong]
+                weight: 1
+                src_prefix: "｟_pf_src｠"
+                tgt_prefix: "｟_pf_tgt｠"
+        """)
+        opt = Namespace(data=corpora, seed=-1)
+        prefix_transform = prefix_cls(opt)
+        prefix_transform.warm_up()
+        filter_cls = get_transforms_cls(["filtertoolong"])["filtertoolong"]
+        opt = Namespace(src_seq_length=4, tgt_seq_length=4)
+        filter_transform = filter_cls(opt)
+        transform_pipe = TransformPipe.build_from(
+            [prefix_transform, filter_transform]
+        )
+        batch = [
+            {"src": ["Hello", ",", "world", "."],
+             "tgt": ["Bonjour", "le", "monde", "."]},
+            {"src": ["Hello", "world"], "tgt": ["Bonjour", "monde"]},
+        ]
+        batch_after = transform_pipe.batch_apply(
+            copy.deepcopy(batch), corpus_name="trainset"
+        )
+        # filtered examples are kept in place as None
+        self.assertEqual(len(batch_after), len(batch))
+        self.assertIsNone(batch_after[0])
+        self.assertEqual(
+            batch_after[1],
+            transform_pipe.apply(
+                copy.deepcopy(batch[1]), corpus_name="trainset"
+            ),
+        )
+        # applying in worker processes gives the same examples in order
+        batch_parallel = transform_pipe.parallel_apply(
+            copy.deepcopy(batch), workers=2, chunk_size=1,
+            corpus_name="trainset"
+        )
+        self.assertEqual(batch_parallel, batch_after)
+
 
 class TestMiscTransform(unittest.TestCase):
     def test_prefix(self):
@@ -139,6 +184,80 @@ class TestMiscTransform(unittest.TestCase):
         ex_out = filter_transform.apply(ex_in)
         self.assertIsNone(ex_out)
 
+    def test_pre_tokenize(self):
+        pre_tokenize_cls = get_transforms_cls(["pre_tokenize"])["pre_tokenize"]
+        test_cases = [
+            # (intra_word_punctuation, sticky_punctuation, input, expected)
+            (".',-", ".", "Hello, world!", ["Hello", ",", "world", "!"]),
+            (".',-", ".", "U.S.A. is big.", ["U.S.A.", "is", "big", "."]),
+            (".',-", ".", "don't stop...", ["don't", "stop", "..."]),
+            (".',-", ".", '(hi) "there"',
+             ["(", "hi", ")", '"', "there", '"']),
+            (".',-", ".", "a--b ?!", ["a", "--", "b", "?", "!"]),
+            (".',-", ".", "e.g. this", ["e.g.", "thi", "s"]),
+            (".',-", ".", "abc", ["ab", "c"]),
+            (".',-", ".", "aa", ["aa"]),
+            (".',-", ".", "", []),
+            ("", "", "Hello, world.", ["Hello", ",", "world", "."]),
+            ("", "", "it's e.g. fine",
+             ["it", "'", "s", "e", ".", "g", ".", "fin", "e"]),
+            ("]^\\-", "[", "a]b^c\\d-e [x] y[",
+             ["a]b^c\\d-e", "[", "x", "]", "y", "["]),
+            ("]^\\-", "[", "[[a]]", ["[[", "a", "]]"]),
+        ]
+        for intra_word, sticky, sentence, expected in test_cases:
+            opt = Namespace(intra_word_punctuation=intra_word,
+                            sticky_punctuation=sticky)
+            pre_tokenize_transform = pre_tokenize_cls(opt)
+            ex_in = {"src": sentence.split(), "tgt": sentence.split()}
+            ex_out = pre_tokenize_transform.apply(ex_in)
+            self.assertEqual(ex_out["src"], expected, sentence)
+            self.assertEqual(ex_out["tgt"], expected, sentence)
+
+    def test_normalize_batch_apply(self):
+        normalize_cls = get_transforms_cls(["normalize"])["normalize"]
+        opt = Namespace(no_normalize_quotes=False,
+                        no_normalize_contractions=False,
+                        no_unicode_normalization=False,
+                        unicode_normalization_form="NFKC")
+        normalize_transform = normalize_cls(opt)
+        batch = [
+            {"src": ["Hello", "world", "."],
+             "tgt": ["Bonjour", "le", "monde", "."]},
+            {"src": ["«Hello»", "l’homme", "ﬁne"],
+             "tgt": ["„café“", "non\u00a0breaking"]},
+            {"src": [], "tgt": ["empty", "source"]},
+            {"src": ["“quoted”"], "tgt": []},
+        ]
+        ex_out = [normalize_transform.apply(copy.deepcopy(ex))
+                  for ex in batch]
+        batch_out = normalize_transform.batch_apply(copy.deepcopy(batch))
+        self.assertEqual(batch_out, ex_out)
+        self.assertEqual(batch_out[0], batch[0])
+        self.assertEqual(batch_out[1]["src"], ['"Hello"', "l'homme", "fine"])
+        self.assertEqual(batch_out[1]["tgt"], ['"café"', "non", "breaking"])
+        self.assertEqual(batch_out[2]["src"], [])
+        self.assertEqual(batch_out[3]["tgt"], [])
+
+    def test_clean_ted(self):
+        clean_ted_cls = get_transforms_cls(["clean_ted"])["clean_ted"]
+        clean_ted_transform = clean_ted_cls(Namespace())
+        test_cases = [
+            ("Thank you. (Applause)", ["Thank", "you."]),
+            ("(Laughter) So (ha) ok", ["So", "ok"]),
+            ("a (b", ["a", "(b"]),
+            ("♫ la la ♫", ["la", "la"]),
+            ("x ♫ y", ["x", "y"]),
+            # attached notes are removed without merging the next token
+            ("b♫a♫ next", ["ba", "next"]),
+            ("", []),
+        ]
+        for sentence, expected in test_cases:
+            ex_in = {"src": sentence.split(), "tgt": sentence.split()}
+            ex_out = clean_ted_transform.apply(ex_in)
+            self.assertEqual(ex_out["src"], expected, sentence)
+            self.assertEqual(ex_out["tgt"], expected, sentence)
+
 
 class TestSubwordTransform(unittest.TestCase):
     @classmethod
@@ -290,6 +409,23 @@ class TestSamplingTransform(unittest.TestCase):
         ex_after = tokendrop_transform.apply(copy.deepcopy(ex), is_train=True)
         self.assertNotEqual(ex_after, ex)
 
+    def test_tokendrop_parallel_apply(self):
+        tokendrop_cls = get_transforms_cls(["tokendrop"])["tokendrop"]
+        opt = Namespace(seed=3434, tokendrop_temperature=0.1)
+        tokendrop_transform = tokendrop_cls(opt)
+        tokendrop_transform.warm_up()
+        tokens = [str(i) for i in range(50)]
+        batch = [{"src": list(tokens), "tgt": list(tokens)}] * 4
+        random.seed(1234)
+        batch_after = tokendrop_transform.parallel_apply(
+            copy.deepcopy(batch), workers=2, chunk_size=2, is_train=True)
+        # each chunk is seeded differently, whichever worker handles it
+        self.assertNotEqual(batch_after[:2], batch_after[2:])
+        random.seed(1234)
+        batch_again = tokendrop_transform.parallel_apply(
+            copy.deepcopy(batch), workers=1, chunk_size=2, is_train=True)
+        self.assertEqual(batch_again, batch_after)
+
     def test_tokenmask(self):
         tokenmask_cls = get_transforms_cls(["tokenmask"])["tokenmask"]
         opt = Namespace(seed=3434, tokenmask_temperature=0.1)
@@ -1,12 +1,63 @@
-from itertools import zip_longest
+from functools import lru_cache
 from string import punctuation, whitespace
-from typing import List
+from typing import FrozenSet, List, Pattern, Tuple
 
-import regex as rx
+import re
 import unicodedata
 
 from onmt.transforms import register_transform, Transform
 
+# str.isascii only exists from Python 3.7
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _is_ascii(text: str) -> bool:
+    """Return whether `text` only contains ASCII characters."""
+    return _NON_ASCII.search(text) is None
+
+
+def _char_class(chars) -> str:
+    """Return a regular expression character class matching any of `chars`."""
+    if not chars:
+        return '(?!)'
+    return '[' + ''.join(re.escape(char) for char in sorted(chars)) + ']'
+
+
+@lru_cache(maxsize=8)
+def _pre_tokenize_sets(intra_word_punctuation: str, sticky_punctuation: str) \
+        -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]:
+    """Return the inter-word, non-sticky and whitespace or punctuation character sets used by `PreTokenize`."""
+    return (
+        frozenset(punctuation).difference(intra_word_punctuation),
+        frozenset(punctuation).difference(sticky_punctuation),
+        frozenset(whitespace + punctuation),
+    )
+
+
+@lru_cache(maxsize=8)
+def _split_punctuation_pattern(inter_word_chars: FrozenSet[str], non_sticky_chars: FrozenSet[str],
+                               whitespace_or_punctuation_chars: FrozenSet[str]) -> Pattern:
+    """
+    Return the zero-width pattern matching each position where `PreTokenize` inserts a space between two different
+    characters. Sentences are terminated by a '\\0' sentinel, so the last character is always followed by one.
+    """
+    inter_word = _char_class(inter_word_chars)
+    non_sticky = _char_class(non_sticky_chars)
+    whitespace_or_punctuation = _char_class(whitespace_or_punctuation_chars)
+    any_punctuation = _char_class(punctuation)
+    return re.compile(
+        # Before a punctuation mark that is inter-word, non-sticky and followed by whitespace or punctuation,
+        # or repeated
+        rf"(?={any_punctuation})(?<=(.))(?!\1)"
+        rf"(?:(?={inter_word})|(?={non_sticky}{whitespace_or_punctuation})|(?=(.)\2))"
+        # After a punctuation mark that is inter-word, or non-sticky and preceded by whitespace or punctuation
+        rf"|(?<={any_punctuation})(?<=(.))(?!\3)"
+        rf"(?:(?<={inter_word})|(?<={whitespace_or_punctuation}{non_sticky})|(?<=^{non_sticky}))"
+        # Before the last character
+        rf"|(?=.\0)(?<=(.))(?!\4)",
+        flags=re.DOTALL
+    )
+
 
 @register_transform(name='normalize')
 class Normalize(Transform):
@@ -14,6 +65,13 @@ class Normalize(Transform):
     Normalize input text by applying Unicode normalization, and replacing unconventional quotes with regular ones.
     """
 
+    quote_table = str.maketrans(dict.fromkeys(
+        "\u00AB\u2039\u00BB\u203A\u201E\u201C\u201F\u201D\u0022\u275D\u275E\u276E"
+        "\u276F\u2E42\u301D\u301E\u301F\uFF02\u201A\u2018\u201B\u275B\u275C\u275F",
+        '"'
+    ))
+    contraction_table = str.maketrans({'\u2019': "'"})
+
     @classmethod
     def add_options(cls, parser):
         """Avalilable options relate to this Transform."""
@@ -33,45 +91,39 @@ class Normalize(Transform):
         self.no_unicode_normalization = self.opts.no_unicode_normalization
         self.unicode_normalization_form = self.opts.unicode_normalization_form
 
-    def _normalize(self, sentence: List[str]) -> List[str]:
-        sentence = ' '.join(sentence)
-
-        # Normalize quotes
+        # Quotes and contractions are normalized in a single pass
+        self._translation_table = {}
         if not self.no_normalize_quotes:
-            sentence = sentence.replace("\u00AB", '"') \
-                .replace("\u2039", '"') \
-                .replace("\u00BB", '"') \
-                .replace("\u203A", '"') \
-                .replace("\u201E", '"') \
-                .replace("\u201C", '"') \
-                .replace("\u201F", '"') \
-                .replace("\u201D", '"') \
-                .replace("\u0022", '"') \
-                .replace("\u275D", '"') \
-                .replace("\u275E", '"') \
-                .replace("\u276E", '"') \
-                .replace("\u276F", '"') \
-                .replace("\u2E42", '"') \
-                .replace("\u301D", '"') \
-                .replace("\u301E", '"') \
-                .replace("\u301F", '"') \
-                .replace("\uFF02", '"') \
-                .replace("\u201A", '"') \
-                .replace("\u2018", '"') \
-                .replace("\u201B", '"') \
-                .replace("\u275B", '"') \
-                .replace("\u275C", '"') \
-                .replace("\u275F", '"')
-
-        # Normalize contractions
+            self._translation_table.update(self.quote_table)
         if not self.no_normalize_contractions:
-            sentence = sentence.replace(r'’', r"'")
+            self._translation_table.update(self.contraction_table)
+
+    def _normalize_str(self, sentence: str) -> str:
+        # All replaced quotes and contractions are non-ASCII and so are all characters changed by unicode
+        # normalization, so there is nothing to do for ASCII sentences
+        if _is_ascii(sentence):
+            return sentence
 
-        # Normalize Unicode symbols and accents
-        if not self.no_unicode_normalization:
+        # Normalize quotes and contractions
+        if self._translation_table:
+            sentence = sentence.translate(self._translation_table)
+
+        # Normalize Unicode symbols and accents, unless only quotes were non-ASCII
+        if not self.no_unicode_normalization and not _is_ascii(sentence):
             sentence = unicodedata.normalize(self.unicode_normalization_form, sentence)
 
-        return sentence.strip().split()
+        return sentence
+
+    def _normalize(self, sentence: List[str]) -> List[str]:
+        if not sentence:
+            return sentence
+        joined = ' '.join(sentence)
+        normalized = self._normalize_str(joined)
+
+        # Tokens only need to be split again if normalization changed anything
+        if normalized == joined:
+            return sentence
+        return normalized.strip().split()
 
     def apply(self, example, is_train=False, stats=None, **kwargs):
         example['src'] = self._normalize(example['src'])
@@ -104,40 +156,22 @@ class PreTokenize(Transform):
                        "into sentences. Defaults to: '.'")
 
     def _parse_opts(self):
-        self.inter_word_punctuation = set(punctuation).difference(self.opts.intra_word_punctuation)
-        self.non_sticky_punctuation = set(punctuation).difference(self.opts.sticky_punctuation)
-        self.whitespace_or_punctuation = set(whitespace + punctuation)
-
-    def _pretok_gen(self, sentence: str):
-        prev_char = ' '
-        for char, next_char in zip_longest(sentence, sentence[1:], fillvalue='\0'):
-            char_in_inter_word_punctuation = char in self.inter_word_punctuation
-            char_in_non_sticky_punctuation = char in self.non_sticky_punctuation
-            char_eq_next_char = char == next_char
-            if prev_char != char and (
-                    char_in_inter_word_punctuation or (
-                        char_in_non_sticky_punctuation and next_char in self.whitespace_or_punctuation
-                    ) or (
-                        char in punctuation and char_eq_next_char
-                    ) or next_char == '\0'
-            ):
-                yield ' '
-            yield char
-            if not char_eq_next_char and (
-                    char_in_inter_word_punctuation or (
-                        char_in_non_sticky_punctuation and prev_char in self.whitespace_or_punctuation
-                    )
-            ):
-                yield ' '
-            prev_char = char
+        self.inter_word_punctuation, self.non_sticky_punctuation, self.whitespace_or_punctuation = \
+            _pre_tokenize_sets(self.opts.intra_word_punctuation, self.opts.sticky_punctuation)
+        self.split_punctuation = _split_punctuation_pattern(
+            self.inter_word_punctuation, self.non_sticky_punctuation, self.whitespace_or_punctuation
+        )
 
     def _pre_tokenize(self, sentence: List[str]) -> List[str]:
-        sentence = ' '.join(sentence)
+        if not sentence:
+            return sentence
 
         # Split punctuation marks from words
-        sentence = ''.join(self._pretok_gen(sentence))
+        pre_tokenized, n_splits = self.split_punctuation.subn(' ', ' '.join(sentence) + '\0')
+        if n_splits == 0:
+            return sentence
 
-        return sentence.strip().split()
+        return pre_tokenized[:-1].strip().split()
 
     def apply(self, example, is_train=False, stats=None, **kwargs):
         example['src'] = self._pre_tokenize(example['src'])
@@ -149,15 +183,21 @@ class PreTokenize(Transform):
 class CleanTED(Transform):
     """Remove audience reactions from TEDx talk transcripts."""
 
-    remove_bracket = rx.compile(r"\([^)]+\)")
+    remove_bracket = re.compile(r"\([^)]+\)")
+    remove_notes = str.maketrans({'♫': None})
 
     def clean(self, sentence: List[str]) -> List[str]:
-        sentence = ' '.join(sentence)
-        if '(' in sentence and ')' in sentence:
-            sentence = self.remove_bracket.sub('', sentence)
-        if '♫' in sentence:
-            sentence = sentence.replace('♫ ', '').replace('♫', '')
-        return sentence.strip().split()
+        if not sentence:
+            return sentence
+        joined = ' '.join(sentence)
+        cleaned = joined
+        if '(' in cleaned:
+            cleaned = self.remove_bracket.sub('', cleaned)
+        if '♫' in cleaned:
+            cleaned = cleaned.translate(self.remove_notes)
+        if cleaned == joined:
+            return sentence
+        return cleaned.strip().split()
 
     def apply(self, example, is_train=False, stats=None, **kwargs):
         example['src'] = self.clean(example['src'])
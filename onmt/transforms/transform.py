@@ -1,5 +1,8 @@
 """Base Transform class and relate utils."""
 import torch
+import random
+import multiprocessing as mp
+from functools import partial
 from onmt.utils.logging import logger
 from onmt.utils.misc import check_path
 from onmt.inputters.fields import get_vocabs
@@ -60,6 +63,61 @@ class Transform(object):
         """
         raise NotImplementedError
 
+    def batch_apply(self, batch, is_train=False, stats=None, **kwargs):
+        """Apply transform to each example of `batch`.
+
+        This should be override if the transform can process several
+        examples at once more efficiently than one by one.
+
+        Args:
+            batch (list): a list of examples as accepted by `apply`;
+            is_train (bool): Indicate if src/tgt is training data;
+            stats (TransformStatistics): a statistic object.
+
+        Returns:
+            list: transformed examples, None for filtered ones.
+        """
+        return [self.apply(example, is_train=is_train, stats=stats, **kwargs)
+                for example in batch]
+
+    def parallel_apply(self, batch, workers=None, chunk_size=1024,
+                       is_train=False, **kwargs):
+        """Apply transform to each example of `batch` in worker processes.
+
+        `batch` is split in chunks of `chunk_size` examples that are
+        transformed with `batch_apply` by a pool of `workers` processes.
+        Statistics of the transform are not collected.
+
+        Before each chunk, the transform is reseeded with its own seed drawn
+        from `random` in the calling process. Stochastic transforms thus
+        draw different noise for every chunk, and the output does not
+        depend on which worker handles a chunk.
+
+        A new process pool is started on every call. Call this once on a
+        large list of examples rather than for every bucket.
+
+        Args:
+            batch (list): a list of examples as accepted by `apply`;
+            workers (int): number of processes, default to cpu count;
+            chunk_size (int): number of examples sent at once to a worker;
+            is_train (bool): Indicate if src/tgt is training data.
+
+        Returns:
+            list: transformed examples, None for filtered ones.
+        """
+        chunks = [batch[i:i + chunk_size]
+                  for i in range(0, len(batch), chunk_size)]
+        base_seed = random.randrange(2 ** 31)
+        seeded_chunks = [(base_seed + i, chunk)
+                         for i, chunk in enumerate(chunks)]
+        worker_fn = partial(_batch_apply_worker, is_train=is_train, **kwargs)
+        with mp.Pool(workers, initializer=_init_worker,
+                     initargs=(self,)) as pool:
+            transformed = []
+            for chunk in pool.imap(worker_fn, seeded_chunks):
+                transformed.extend(chunk)
+        return transformed
+
     def apply_reverse(self, translated):
         return translated
 
@@ -101,6 +159,19 @@ class Transform(object):
         return '{}({})'.format(cls_name, cls_args)
 
 
+def _init_worker(transform):
+    """Set the transform used by `_batch_apply_worker` in this process."""
+    _batch_apply_worker.transform = transform
+
+
+def _batch_apply_worker(seeded_chunk, **kwargs):
+    """Apply the transform of this worker process to a seeded chunk."""
+    seed, chunk = seeded_chunk
+    transform = _batch_apply_worker.transform
+    transform._set_seed(seed)
+    return transform.batch_apply(chunk, **kwargs)
+
+
 class ObservableStats:
     """A running observable statistics."""
 
@@ -167,6 +238,11 @@ class TransformPipe(Transform):
         transform_pipe = cls(None, transform_list)
         return transform_pipe
 
+    def _set_seed(self, seed):
+        """Set seed of all transforms in the pipe."""
+        for transform in self.transforms:
+            transform._set_seed(seed)
+
     def warm_up(self, vocabs):
         """Warm up Pipeline by iterate over all transfroms."""
         for transform in self.transforms:
@@ -196,6 +272,28 @@ class TransformPipe(Transform):
                 break
         return example
 
+    def batch_apply(self, batch, is_train=False, **kwargs):
+        """Apply transform pipe to each example of `batch`.
+
+        Args:
+            batch (list): a list of dict of field value, ex. src, tgt.
+
+        Returns:
+            list: transformed examples, None for filtered ones.
+        """
+        batch = list(batch)
+        indices = list(range(len(batch)))
+        for transform in self.transforms:
+            transformed = transform.batch_apply(
+                [batch[i] for i in indices],
+                is_train=is_train, stats=self.statistics, **kwargs)
+            for i, example in zip(indices, transformed):
+                batch[i] = example
+            indices = [i for i in indices if batch[i] is not None]
+            if len(indices) == 0:
+                break
+        return batch
+
     def apply_reverse(self, translated):
         for transform in self.transforms:
             translated = transform.apply_reverse(translated)